@@ -13,12 +13,18 @@ import os
 import re
 import json
 import logging
-from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Tuple
+import functools
+from collections.abc import Mapping
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,8 +32,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Flat frontmatter line: key followed by a double-quoted string, a flow list
+# of double-quoted strings, or a plain decimal number
+_QUOTED_VALUE = r'"[^"\\\n]*"'
+_SIMPLE_FRONTMATTER_LINE = re.compile(
+    rf'([A-Za-z_][\w-]*): +('
+    rf'{_QUOTED_VALUE}'
+    rf'|\[ *(?:{_QUOTED_VALUE}(?: *, *{_QUOTED_VALUE})*)? *\]'
+    rf'|-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?'
+    rf') *'
+)
+_QUOTED_ITEM = re.compile(r'"([^"]*)"')
+
+# Plain keys YAML would resolve to booleans or null rather than strings
+_YAML_RESERVED_KEYS = frozenset({"yes", "no", "true", "false", "on", "off", "null"})
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RoutingDecision:
     """Result of routing decision"""
     agentId: str
@@ -37,6 +58,92 @@ class RoutingDecision:
     complexity: str
     keywords: Dict[str, List[str]]
     skill_files_used: List[str]
+    flat_keywords: List[str] = field(default_factory=list)
+
+
+# Word starts in a query (\w runs, as delimited by \b)
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def _is_whole_word_keyword(keyword: str) -> bool:
+    """Short single-word keywords only match a complete word"""
+    return " " not in keyword and len(keyword) <= 3
+
+
+class _KeywordTrie:
+    """
+    Trie over single-word routing keywords.
+
+    Keywords only match at a word start, so the query is scanned by walking
+    the trie from each word start until no edge exists; every keyword
+    terminal passed on the way is a match.
+    """
+
+    def __init__(self):
+        self._children: List[Dict[str, int]] = [{}]
+        self._output: List[List[Tuple[bool, Tuple]]] = [[]]
+
+    def add_word(self, keyword: str, payload: Tuple, whole_word: bool = False) -> None:
+        """Register keyword with payload (may be called repeatedly per keyword)"""
+
+        node = 0
+        for char in keyword:
+            child = self._children[node].get(char)
+            if child is None:
+                child = len(self._children)
+                self._children[node][char] = child
+                self._children.append({})
+                self._output.append([])
+            node = child
+
+        self._output[node].append((whole_word, payload))
+
+    def iter(self, text: str):
+        """Yield the payload of every keyword matched at a word start of text"""
+
+        children, output = self._children, self._output
+        length = len(text)
+        for word in _WORD_PATTERN.finditer(text):
+            word_end = word.end()
+            node = 0
+            index = word.start()
+            while index < length:
+                node = children[node].get(text[index])
+                if node is None:
+                    break
+                index += 1
+                for whole_word, payload in output[node]:
+                    # Whole-word keywords must end where the word ends
+                    if not whole_word or index == word_end:
+                        yield payload
+
+
+class _LazyFrontmatter(Mapping):
+    """
+    Read-only mapping of skill graph file names to their frontmatter.
+
+    Only file paths are known up front; each file is parsed the first time
+    its entry is accessed and the result is kept for later lookups.
+    """
+
+    def __init__(self, paths: Dict[str, str], parse: Callable[[str], Dict]):
+        self._paths = paths
+        self._parse = parse
+        self._parsed: Dict[str, Dict] = {}
+
+    def __getitem__(self, name: str) -> Dict:
+        try:
+            return self._parsed[name]
+        except KeyError:
+            frontmatter = self._parse(self._paths[name])
+            self._parsed[name] = frontmatter
+            return frontmatter
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
 
 
 class SkillGraphRouter:
@@ -50,6 +157,15 @@ class SkillGraphRouter:
     # Skill graph path (configurable)
     DEFAULT_SKILL_GRAPH_PATH = "/root/openclaw-assistant/routing-knowledge"
 
+    # Number of distinct (query, channel context) routing results memoized
+    ROUTE_CACHE_SIZE = 4096
+
+    # Longer queries (plus channel context) are routed without being memoized
+    ROUTE_CACHE_MAX_KEY_LENGTH = 2048
+
+    # Bytes read at a time when looking for the end of a frontmatter block
+    FRONTMATTER_READ_SIZE = 8192
+
     # Complexity scoring configuration
     COMPLEXITY_CONFIG = {
         "simple_indicators": {
@@ -76,6 +192,34 @@ class SkillGraphRouter:
         }
     }
 
+    # Domain scoring: (domain, base score, multiplier per matched keyword).
+    # Order matters: ties between domains go to the earlier entry.
+    DOMAIN_SCORING = (
+        ("security", 0.6, 0.1),  # highest priority
+        ("development", 0.5, 0.08),
+        ("planning", 0.4, 0.07),
+        ("database", 0.5, 0.06)
+    )
+
+    # Security score above which the security agent always wins
+    SECURITY_PRIORITY_THRESHOLD = 0.5
+
+    # Channel context rules: channel -> (context field, ((topic words, domain), ...)).
+    # The first rule with a word contained in the field adds the bonus.
+    CHANNEL_CONTEXT_RULES = {
+        "slack": ("channel_topic", (
+            (("security",), "security"),
+            (("development", "engineering"), "development"),
+            (("planning", "product"), "planning")
+        )),
+        "discord": ("channel_category", (
+            (("security",), "security"),
+            (("development", "engineering"), "development"),
+            (("planning",), "planning")
+        ))
+    }
+    CHANNEL_CONTEXT_BONUS = 0.2
+
     # Security keywords (highest priority)
     SECURITY_KEYWORDS = [
         "security", "vulnerability", "exploit", "penetration", "audit", "xss", "csrf",
@@ -112,6 +256,12 @@ class SkillGraphRouter:
         "project", "phase", "sprint", "agile", "scoping", "capacity", "charter"
     ]
 
+    # Lookup tables derived from the constants above (built once per class)
+    _KEYWORD_TRIE: _KeywordTrie
+    _KEYWORD_PHRASES: List[Tuple[str, Tuple]]
+    _DOMAIN_SCORE_TABLES: Dict[str, Tuple[float, ...]]
+    _CHANNEL_PATTERNS: Dict[str, Tuple[str, Tuple[Tuple[re.Pattern, str], ...]]]
+
     def __init__(self, skill_graph_path: Optional[str] = None):
         """
         Initialize router with skill graph.
@@ -121,17 +271,48 @@ class SkillGraphRouter:
         """
         self.skill_graph_path = skill_graph_path or self.DEFAULT_SKILL_GRAPH_PATH
 
-        # Load skill graph structure
+        # Load skill graph structure (frontmatter is parsed on first access)
         self.skill_files = self._discover_skill_files()
-        self.agents = self._load_agents()
-        self.channels = self._load_channels()
-        self.routing_logic = self._load_routing_logic()
+        parse = self._parse_frontmatter
+        self.agents = _LazyFrontmatter(self.skill_files["agents"], parse)
+        self.channels = _LazyFrontmatter(self.skill_files["channels"], parse)
+        self.routing_logic = _LazyFrontmatter(self.skill_files["routing_logic"], parse)
+
+        # Routing is a pure function of the normalized query and channel context
+        self._route_cached = functools.lru_cache(maxsize=self.ROUTE_CACHE_SIZE)(
+            self._compute_route
+        )
 
         logger.info(
             f"✅ Skill graph loaded: {len(self.agents)} agents, "
             f"{len(self.channels)} channels, {len(self.routing_logic)} routing guides"
         )
 
+    def __init_subclass__(cls, **kwargs):
+        """Rebuild lookup tables for subclasses (they may override constants)"""
+
+        super().__init_subclass__(**kwargs)
+        cls._build_lookup_tables()
+
+    @classmethod
+    def _build_lookup_tables(cls) -> None:
+        """Build the keyword matchers and score tables shared by all routers"""
+
+        cls._KEYWORD_TRIE, cls._KEYWORD_PHRASES = cls._build_matchers()
+        cls._DOMAIN_SCORE_TABLES = cls._build_score_tables()
+        cls._CHANNEL_PATTERNS = cls._build_channel_patterns()
+
+    @classmethod
+    def _domain_keyword_lists(cls) -> Tuple[Tuple[str, List[str]], ...]:
+        """Keyword list for each domain"""
+
+        return (
+            ("security", cls.SECURITY_KEYWORDS),
+            ("development", cls.DEVELOPMENT_KEYWORDS),
+            ("planning", cls.PLANNING_KEYWORDS),
+            ("database", cls.DATABASE_KEYWORDS)
+        )
+
     def _discover_skill_files(self) -> Dict[str, Dict[str, str]]:
         """Discover all markdown files in skill graph"""
 
@@ -142,76 +323,183 @@ class SkillGraphRouter:
         }
 
         # Discover agent files
-        agents_dir = Path(self.skill_graph_path) / "agents"
-        if agents_dir.exists():
-            for md_file in agents_dir.glob("*.md"):
-                agent_name = md_file.stem.replace("agent-", "")
-                files["agents"][agent_name] = str(md_file)
+        agents_dir = os.path.join(self.skill_graph_path, "agents")
+        for stem, path in self._scan_markdown_files(agents_dir):
+            agent_name = stem.replace("agent-", "")
+            files["agents"][agent_name] = path
 
         # Discover channel files
-        channels_dir = Path(self.skill_graph_path) / "channels"
-        if channels_dir.exists():
-            for md_file in channels_dir.glob("*.md"):
-                channel_name = md_file.stem.replace("channel-", "")
-                files["channels"][channel_name] = str(md_file)
+        channels_dir = os.path.join(self.skill_graph_path, "channels")
+        for stem, path in self._scan_markdown_files(channels_dir):
+            channel_name = stem.replace("channel-", "")
+            files["channels"][channel_name] = path
 
         # Discover routing logic files
-        logic_dir = Path(self.skill_graph_path) / "routing-logic"
-        if logic_dir.exists():
-            for md_file in logic_dir.glob("*.md"):
-                logic_name = md_file.stem
-                files["routing_logic"][logic_name] = str(md_file)
+        logic_dir = os.path.join(self.skill_graph_path, "routing-logic")
+        for stem, path in self._scan_markdown_files(logic_dir):
+            files["routing_logic"][stem] = path
 
         return files
 
+    @staticmethod
+    def _scan_markdown_files(directory: str) -> List[Tuple[str, str]]:
+        """List (stem, path) of markdown files in directory (empty if unreadable)"""
+
+        # DirEntry caches the file type from the directory listing, so no
+        # per-file stat or Path objects are needed
+        try:
+            with os.scandir(directory) as entries:
+                return [
+                    (entry.name[:-3], entry.path)
+                    for entry in entries
+                    if entry.name.endswith(".md") and entry.is_file()
+                ]
+        except OSError:
+            # Missing, not a directory, or no permission: no skill files,
+            # as Path.glob behaved
+            return []
+
     def _parse_frontmatter(self, file_path: str) -> Dict:
         """Extract YAML frontmatter from markdown file"""
 
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-
-            # Extract YAML block
-            match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-            if not match:
+            yaml_content = self._read_frontmatter_block(file_path)
+            if yaml_content is None:
                 return {}
 
-            yaml_content = match.group(1)
-            return yaml.safe_load(yaml_content) or {}
+            # Flat key/value blocks skip the general-purpose YAML parser
+            simple = self._parse_simple_frontmatter(yaml_content)
+            if simple is not None:
+                return simple
+
+            return yaml.load(yaml_content, Loader=_YamlLoader) or {}
 
         except Exception as e:
             logger.error(f"Error parsing {file_path}: {e}")
             return {}
 
-    def _load_agents(self) -> Dict:
-        """Load agent claim files"""
+    @classmethod
+    def _read_frontmatter_block(cls, file_path: str) -> Optional[str]:
+        """Read the YAML block between the "---" delimiter lines (None if absent)"""
+
+        # Read only as far as the closing delimiter and decode just the
+        # frontmatter; the markdown body is never read or decoded
+        with open(file_path, 'rb') as f:
+            head = bytearray(f.read(max(cls.FRONTMATTER_READ_SIZE, 4)))
+
+            # Text mode read "---\r\n" and "---\r" openers as "---\n" too
+            if head[:4] not in (b"---\n", b"---\r"):
+                return None
+
+            end = head.find(b"\n---", 4)
+            while end < 0:
+                chunk = f.read(cls.FRONTMATTER_READ_SIZE)
+                if not chunk:
+                    break
+                # The delimiter may straddle two chunks
+                start = max(4, len(head) - 3)
+                head.extend(chunk)
+                end = head.find(b"\n---", start)
+
+            # "\r" line endings: translate newlines like text mode does
+            if b"\r" in head:
+                head.extend(f.read())
+                content = head.decode("utf-8")
+                content = content.replace("\r\n", "\n").replace("\r", "\n")
+                end = content.find("\n---", 4)
+                return content[4:end] if end >= 0 else None
+
+        if end < 0:
+            return None
+
+        return head[4:end].decode("utf-8")
+
+    @staticmethod
+    def _parse_simple_frontmatter(yaml_content: str) -> Optional[Dict]:
+        """Parse flat frontmatter without YAML (None if it needs the full parser)"""
+
+        data = {}
+        for line in yaml_content.splitlines():
+            if not line.strip():
+                continue
+
+            match = _SIMPLE_FRONTMATTER_LINE.fullmatch(line)
+            if not match or match.group(1).lower() in _YAML_RESERVED_KEYS:
+                return None
+
+            key, value = match.groups()
+            if value[0] == '"':
+                data[key] = value[1:-1]
+            elif value[0] == "[":
+                data[key] = _QUOTED_ITEM.findall(value)
+            elif "." in value:
+                data[key] = float(value)
+            else:
+                data[key] = int(value)
+
+        return data
+
+    @classmethod
+    def _build_matchers(cls) -> Tuple[_KeywordTrie, List[Tuple[str, Tuple]]]:
+        """Build the single-word keyword trie and the multi-word phrase list"""
+
+        trie = _KeywordTrie()
+        phrases = []
+
+        entries = [
+            (domain, 0, keyword)
+            for domain, domain_list in cls._domain_keyword_lists()
+            for keyword in domain_list
+        ]
+        entries.extend(
+            ("complexity", config["points"], keyword)
+            for config in cls.COMPLEXITY_CONFIG.values()
+            for keyword in config["keywords"]
+        )
+
+        for payload in entries:
+            keyword = payload[2]
 
-        agents = {}
-        for agent_name, agent_file in self.skill_files["agents"].items():
-            frontmatter = self._parse_frontmatter(agent_file)
-            agents[agent_name] = frontmatter
+            # Multi-word keywords: exact match anywhere in the query
+            if " " in keyword:
+                phrases.append((keyword, payload))
 
-        return agents
+            # Short keywords: whole word; longer keywords: word start
+            else:
+                trie.add_word(keyword, payload, _is_whole_word_keyword(keyword))
 
-    def _load_channels(self) -> Dict:
-        """Load channel claim files"""
+        return trie, phrases
 
-        channels = {}
-        for channel_name, channel_file in self.skill_files["channels"].items():
-            frontmatter = self._parse_frontmatter(channel_file)
-            channels[channel_name] = frontmatter
+    @classmethod
+    def _build_score_tables(cls) -> Dict[str, Tuple[float, ...]]:
+        """Precompute each domain's score for every possible keyword count"""
 
-        return channels
+        # Keywords are deduplicated per domain, so counts never exceed the list
+        max_counts = {
+            domain: len(set(domain_list))
+            for domain, domain_list in cls._domain_keyword_lists()
+        }
 
-    def _load_routing_logic(self) -> Dict:
-        """Load routing logic guides"""
+        return {
+            domain: tuple(
+                min(0.98, base_score * (1.0 + count * multiplier)) if count else 0.0
+                for count in range(max_counts[domain] + 1)
+            )
+            for domain, base_score, multiplier in cls.DOMAIN_SCORING
+        }
 
-        logic = {}
-        for logic_name, logic_file in self.skill_files["routing_logic"].items():
-            frontmatter = self._parse_frontmatter(logic_file)
-            logic[logic_name] = frontmatter
+    @classmethod
+    def _build_channel_patterns(cls) \
+            -> Dict[str, Tuple[str, Tuple[Tuple[re.Pattern, str], ...]]]:
+        """Compile each channel rule's words into one substring alternation"""
 
-        return logic
+        return {
+            channel: (context_field, tuple(
+                (re.compile("|".join(map(re.escape, words))), domain)
+                for words, domain in rules
+            ))
+            for channel, (context_field, rules) in cls.CHANNEL_CONTEXT_RULES.items()
+        }
 
     def route(self, query: str, channel: Optional[str] = None,
               user_context: Optional[Dict] = None) -> RoutingDecision:
@@ -227,18 +515,73 @@ class SkillGraphRouter:
             RoutingDecision with agent, confidence, reason, etc.
         """
 
-        # Step 1: Assess complexity
-        complexity = self._assess_complexity(query)
+        fields = self._cached_route_fields(query, channel, user_context)
+        (agent_id, confidence, reason, domain, level,
+         keywords, flat_keywords, skill_files) = fields
 
-        # Step 2: Extract keywords
-        keywords = self._extract_keywords(query)
+        # Fresh containers so callers cannot mutate cached results
+        return RoutingDecision(
+            agentId=agent_id,
+            confidence=confidence,
+            reason=reason,
+            domain=domain,
+            complexity=level,
+            keywords={name: list(matched) for name, matched in keywords},
+            skill_files_used=list(skill_files),
+            flat_keywords=list(flat_keywords)
+        )
+
+    def _route_as_dict(self, query: str, channel: Optional[str] = None,
+                       user_context: Optional[Dict] = None) -> Dict:
+        """Route straight to the select_agent() response dict"""
+
+        fields = self._cached_route_fields(query, channel, user_context)
+        agent_id, confidence, reason, domain, _, _, flat_keywords, _ = fields
+
+        return {
+            "agentId": agent_id,
+            "confidence": confidence,
+            "reason": reason,
+            "intent": domain,
+            "keywords": list(flat_keywords)
+        }
+
+    def _cached_route_fields(self, query: str, channel: Optional[str],
+                             user_context: Optional[Dict]) -> Tuple:
+        """Look up (or compute) the routing fields for a query"""
+
+        # Normalize once here; private methods receive lowercase strings
+        normalized = query.lower()
+
+        # Only the context field the channel's rules read is part of the key
+        channel_context = ""
+        if channel in self._CHANNEL_PATTERNS:
+            context_field = self._CHANNEL_PATTERNS[channel][0]
+            channel_context = ((user_context or {}).get(context_field) or "").lower()
+
+        # Skip the cache for long inputs (transcripts, pasted code) rather than
+        # holding up to ROUTE_CACHE_SIZE of them for the router's lifetime
+        if len(normalized) + len(channel_context) > self.ROUTE_CACHE_MAX_KEY_LENGTH:
+            return self._compute_route(normalized, channel, channel_context)
+
+        return self._route_cached(normalized, channel, channel_context)
+
+    def _compute_route(self, normalized: str, channel: Optional[str],
+                       channel_context: str) -> Tuple:
+        """Compute routing decision fields (cached by route())"""
+
+        # Step 1: Extract keywords and complexity indicators (single scan)
+        keywords, flat_keywords, indicators = self._extract_keywords(normalized)
+
+        # Step 2: Assess complexity
+        complexity = self._assess_complexity(indicators)
 
         # Step 3: Calculate domain scores
         scores = self._calculate_domain_scores(keywords)
 
         # Step 4: Apply channel context modifiers
-        if channel:
-            scores = self._apply_channel_context(scores, channel, user_context)
+        if channel_context:
+            scores = self._apply_channel_context(scores, channel, channel_context)
 
         # Step 5: Select agent
         agent_id, confidence, domain = self._select_agent(scores, complexity)
@@ -249,40 +592,21 @@ class SkillGraphRouter:
         # Step 7: Track skill files used
         skill_files = self._track_skill_files_used(domain, complexity)
 
-        return RoutingDecision(
-            agentId=agent_id,
-            confidence=round(confidence, 2),
-            reason=reason,
-            domain=domain,
-            complexity=complexity["level"],
-            keywords=keywords,
-            skill_files_used=skill_files
+        return (
+            agent_id,
+            round(confidence, 2),
+            reason,
+            domain,
+            complexity["level"],
+            tuple((name, tuple(matched)) for name, matched in keywords.items()),
+            tuple(flat_keywords),
+            tuple(skill_files)
         )
 
-    def _assess_complexity(self, query: str) -> Dict:
+    def _assess_complexity(self, indicators: Dict[str, int]) -> Dict:
         """Assess task complexity: simple, moderate, or complex"""
 
-        score = 0
-        indicators = []
-        normalized = query.lower()
-
-        # Check simple indicators
-        for keyword in self.COMPLEXITY_CONFIG["simple_indicators"]["keywords"]:
-            if self._match_keyword(normalized, keyword):
-                score += self.COMPLEXITY_CONFIG["simple_indicators"]["points"]
-                indicators.append(keyword)
-
-        # Check moderate indicators
-        for keyword in self.COMPLEXITY_CONFIG["moderate_indicators"]["keywords"]:
-            if self._match_keyword(normalized, keyword):
-                score += self.COMPLEXITY_CONFIG["moderate_indicators"]["points"]
-                indicators.append(keyword)
-
-        # Check complex indicators
-        for keyword in self.COMPLEXITY_CONFIG["complex_indicators"]["keywords"]:
-            if self._match_keyword(normalized, keyword):
-                score += self.COMPLEXITY_CONFIG["complex_indicators"]["points"]
-                indicators.append(keyword)
+        score = sum(indicators.values())
 
         # Determine level
         if score < 4:
@@ -298,127 +622,74 @@ class SkillGraphRouter:
         return {
             "level": level,
             "score": score,
-            "indicators": indicators,
+            "indicators": list(indicators),
             "confidence": confidence
         }
 
-    def _extract_keywords(self, query: str) -> Dict[str, List[str]]:
-        """Extract matching keywords from query by domain"""
-
-        keywords = {
-            "security": [],
-            "development": [],
-            "planning": [],
-            "database": []
-        }
-
-        normalized = query.lower()
-
-        # Match keywords
-        for keyword in self.SECURITY_KEYWORDS:
-            if self._match_keyword(normalized, keyword):
-                keywords["security"].append(keyword)
-
-        for keyword in self.DEVELOPMENT_KEYWORDS:
-            if self._match_keyword(normalized, keyword):
-                keywords["development"].append(keyword)
-
-        for keyword in self.PLANNING_KEYWORDS:
-            if self._match_keyword(normalized, keyword):
-                keywords["planning"].append(keyword)
-
-        for keyword in self.DATABASE_KEYWORDS:
-            if self._match_keyword(normalized, keyword):
-                keywords["database"].append(keyword)
-
-        # Deduplicate
-        for domain in keywords:
-            keywords[domain] = list(set(keywords[domain]))
-
-        return keywords
+    def _extract_keywords(self, normalized: str) \
+            -> Tuple[Dict[str, List[str]], List[str], Dict[str, int]]:
+        """
+        Extract keywords and complexity indicators from a normalized query.
 
-    def _match_keyword(self, query: str, keyword: str) -> bool:
-        """Match keyword with word-boundary awareness"""
+        Returns keywords by domain, all domain keywords as one flat list
+        (deduplicated across domains), and complexity indicators mapped to
+        their points. Keyword lists are in match order.
+        """
 
-        # Multi-word keywords: exact match
-        if " " in keyword:
-            return keyword in query
+        # Insertion-ordered dicts serve as sets: repeated matches are
+        # deduplicated on insert and first-match order is kept
+        keywords: Dict[str, Dict[str, None]] = {
+            "security": {},
+            "development": {},
+            "planning": {},
+            "database": {}
+        }
+        indicators: Dict[str, int] = {}
+        flat_keywords: Dict[str, None] = {}
 
-        # Short keywords: word boundary match
-        if len(keyword) <= 3:
-            pattern = rf"\b{re.escape(keyword)}\b"
-            return bool(re.search(pattern, query))
+        # Single-word keywords in one trie walk, multi-word ones by substring
+        matches = list(self._KEYWORD_TRIE.iter(normalized))
+        matches.extend(
+            payload for phrase, payload in self._KEYWORD_PHRASES if phrase in normalized
+        )
 
-        # Longer keywords: word-start match
-        pattern = rf"\b{re.escape(keyword)}"
-        return bool(re.search(pattern, query))
+        for bucket, points, keyword in matches:
+            if bucket == "complexity":
+                indicators[keyword] = points
+            else:
+                keywords[bucket][keyword] = None
+                flat_keywords[keyword] = None
+
+        return (
+            {domain: list(matched) for domain, matched in keywords.items()},
+            list(flat_keywords),
+            indicators
+        )
 
     def _calculate_domain_scores(self, keywords: Dict[str, List[str]]) -> Dict[str, float]:
         """Calculate confidence score for each domain"""
 
-        scores = {
-            "security": 0.0,
-            "development": 0.0,
-            "planning": 0.0,
-            "database": 0.0
-        }
+        scores = dict.fromkeys(self._DOMAIN_SCORE_TABLES, 0.0)
+        for domain, score_table in self._DOMAIN_SCORE_TABLES.items():
+            scores[domain] = score_table[len(keywords[domain])]
 
-        # Security: highest priority
-        if keywords["security"]:
-            base_score = 0.6
-            multiplier = 1.0 + (len(keywords["security"]) * 0.1)
-            scores["security"] = min(0.98, base_score * multiplier)
-
-        # Development
-        if keywords["development"]:
-            base_score = 0.5
-            multiplier = 1.0 + (len(keywords["development"]) * 0.08)
-            scores["development"] = min(0.98, base_score * multiplier)
-
-        # Planning
-        if keywords["planning"]:
-            base_score = 0.4
-            multiplier = 1.0 + (len(keywords["planning"]) * 0.07)
-            scores["planning"] = min(0.98, base_score * multiplier)
-
-        # Database
-        if keywords["database"]:
-            base_score = 0.5
-            multiplier = 1.0 + (len(keywords["database"]) * 0.06)
-            scores["database"] = min(0.98, base_score * multiplier)
+            # Security priority short-circuit: channel context only raises
+            # scores, so the agent is decided and other domains can stay at 0
+            if domain == "security" and scores[domain] > self.SECURITY_PRIORITY_THRESHOLD:
+                break
 
         return scores
 
     def _apply_channel_context(self, scores: Dict[str, float], channel: str,
-                               context: Optional[Dict] = None) -> Dict[str, float]:
-        """Apply channel-specific routing modifiers"""
-
-        if not context:
-            context = {}
-
-        # Slack: check channel topic
-        if channel == "slack":
-            topic = context.get("channel_topic", "").lower()
-            if "security" in topic:
-                scores["security"] += 0.2
-            elif "development" in topic or "engineering" in topic:
-                scores["development"] += 0.2
-            elif "planning" in topic or "product" in topic:
-                scores["planning"] += 0.2
-
-        # Discord: check guild and category
-        elif channel == "discord":
-            category = context.get("channel_category", "").lower()
-            if "security" in category:
-                scores["security"] += 0.2
-            elif "development" in category or "engineering" in category:
-                scores["development"] += 0.2
-            elif "planning" in category:
-                scores["planning"] += 0.2
-
-        # Ensure scores stay in valid range
-        for domain in scores:
-            scores[domain] = min(0.98, scores[domain])
+                               channel_context: str) -> Dict[str, float]:
+        """Apply channel-specific routing modifiers (context text lowercased)"""
+
+        _, rules = self._CHANNEL_PATTERNS.get(channel, ("", ()))
+        for pattern, domain in rules:
+            if pattern.search(channel_context):
+                # Ensure scores stay in valid range
+                scores[domain] = min(0.98, scores[domain] + self.CHANNEL_CONTEXT_BONUS)
+                break
 
         return scores
 
@@ -427,7 +698,7 @@ class SkillGraphRouter:
         """Select best agent from scores and complexity"""
 
         # Rule 1: Security keywords always take priority
-        if scores["security"] > 0.5:
+        if scores["security"] > self.SECURITY_PRIORITY_THRESHOLD:
             return "hacker_agent", scores["security"], "security"
 
         # Rule 2: Complex tasks → PM for coordination
@@ -496,12 +767,16 @@ class SkillGraphRouter:
         return files_used
 
 
+# Lookup tables are built once at import and shared by every router
+SkillGraphRouter._build_lookup_tables()
+
+
 # Global router instance
 _router: Optional[SkillGraphRouter] = None
 
 
 def initialize_router(skill_graph_path: Optional[str] = None) -> SkillGraphRouter:
-    """Initialize global router instance"""
+    """Initialize global router instance (starts with an empty route cache)"""
 
     global _router
     _router = SkillGraphRouter(skill_graph_path)
@@ -526,15 +801,7 @@ def select_agent(query: str, channel: Optional[str] = None,
     if not _router:
         _router = initialize_router()
 
-    decision = _router.route(query, channel=channel, user_context=user_context)
-
-    return {
-        "agentId": decision.agentId,
-        "confidence": decision.confidence,
-        "reason": decision.reason,
-        "intent": decision.domain,
-        "keywords": [kw for kws in decision.keywords.values() for kw in kws]
-    }
+    return _router._route_as_dict(query, channel=channel, user_context=user_context)
 
 
 if __name__ == "__main__":